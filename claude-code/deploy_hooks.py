@@ -3,18 +3,24 @@
 Deploy hooks from this project to ~/.claude directory.
 Updates settings.json to register the hooks.
 """
+import itertools
 import json
+import os
 import shutil
 import sys
 from pathlib import Path
 
 # Paths
 PROJECT_ROOT = Path(__file__).parent
-HOOKS_SOURCE = PROJECT_ROOT / "src" / "hooks"
+HOOKS_SOURCE = PROJECT_ROOT / "hooks"
+NATIVE_HOOKS_BUILD = PROJECT_ROOT / "native" / "target" / "release"
 CLAUDE_DIR = Path.home() / ".claude"
 CLAUDE_HOOKS_DIR = CLAUDE_DIR / "hooks"
 CLAUDE_SETTINGS = CLAUDE_DIR / "settings.json"
 
+# Shared modules imported by the hooks: deployed with them but not registered
+SUPPORT_MODULES = {"hooks_common.py", "hooks_db.py"}
+
 
 def ensure_claude_dirs():
     """Ensure ~/.claude and ~/.claude/hooks directories exist."""
@@ -24,36 +30,62 @@ def ensure_claude_dirs():
 
 
 def get_hook_files():
-    """Get all hook files from src/hooks/, excluding __init__.py."""
+    """Get all hook files from hooks/, excluding __init__.py."""
     if not HOOKS_SOURCE.exists():
         print(f"✗ Source hooks directory not found: {HOOKS_SOURCE}")
         return []
 
-    hooks = []
-    for file in HOOKS_SOURCE.iterdir():
-        if file.is_file() and file.name != "__init__.py":
-            hooks.append(file)
+    # scandir's DirEntry carries the file type, so no extra stat() per entry
+    with os.scandir(HOOKS_SOURCE) as entries:
+        hooks = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and entry.name != "__init__.py"
+        ]
 
     return hooks
 
 
+def find_native_hook(hook_file):
+    """Return the compiled build of a hook script, if one has been built."""
+    native = NATIVE_HOOKS_BUILD / hook_file.stem
+    if native.is_file() and os.access(native, os.X_OK):
+        return native
+    return None
+
+
 def copy_hooks(hooks):
-    """Copy hook files to ~/.claude/hooks/."""
+    """
+    Copy hook files to ~/.claude/hooks/.
+
+    Scripts with a native build (cargo build --release in native/) are
+    deployed as that binary instead; the script stays the fallback.
+    Returns (deployed_path, source_script) pairs.
+    """
     if not hooks:
         print("✗ No hooks found to deploy")
         return []
 
     deployed = []
     for hook_file in hooks:
-        dest = CLAUDE_HOOKS_DIR / hook_file.name
-        shutil.copy2(hook_file, dest)
+        if hook_file.name in SUPPORT_MODULES:
+            shutil.copy2(hook_file, CLAUDE_HOOKS_DIR / hook_file.name)
+            print(f"✓ Deployed support module: {hook_file.name}")
+            continue
 
-        # Make executable if it's a script
-        if hook_file.suffix in [".py", ".sh"]:
+        source = find_native_hook(hook_file) or hook_file
+        dest = CLAUDE_HOOKS_DIR / source.name
+        shutil.copy2(source, dest)
+
+        # Make executable if it's a script or native build
+        if source.suffix in [".py", ".sh", ""]:
             dest.chmod(0o755)
 
-        deployed.append(dest)
-        print(f"✓ Deployed: {hook_file.name} -> {dest}")
+        deployed.append((dest, hook_file))
+        if source is hook_file:
+            print(f"✓ Deployed: {hook_file.name} -> {dest}")
+        else:
+            print(f"✓ Deployed: {hook_file.name} (native build) -> {dest}")
 
     return deployed
 
@@ -69,54 +101,24 @@ def load_settings():
 
 def detect_hook_event_type(hook_path):
     """
-    Detect hook event type from filename or file content.
-
-    Naming conventions:
-    - pre-tool-* or pretool-* → PreToolUse
-    - post-tool-* or posttool-* → PostToolUse
-    - prompt-* or user-prompt-* → UserPromptSubmit
-    - session-start-* → SessionStart
-    - session-end-* → SessionEnd
-    - subagent-stop-* → SubagentStop
+    Detect hook event type from the metadata comment in the file's first 10 lines:
 
-    Or use metadata comment in file:
     # CLAUDE_HOOK_EVENT: PreToolUse
-    """
-    hook_name = hook_path.stem.lower()
 
-    # Try to read event type from file metadata
+    Hooks without the header default to PreToolUse (with a warning).
+    """
     try:
         with open(hook_path, "r") as f:
-            first_lines = f.read(500)  # Read first 500 chars
-            for line in first_lines.split("\n")[:10]:  # Check first 10 lines
+            for line in itertools.islice(f, 10):
                 if "CLAUDE_HOOK_EVENT:" in line:
-                    # Extract event type from comment
-                    event_type = line.split("CLAUDE_HOOK_EVENT:")[1].strip()
-                    # Remove any trailing comment characters
-                    event_type = event_type.rstrip("*/-#").strip()
-                    return event_type
-    except Exception:
-        pass  # Fall back to filename detection
-
-    # Filename-based detection
-    if "pre-tool" in hook_name or "pretool" in hook_name:
-        return "PreToolUse"
-    elif "post-tool" in hook_name or "posttool" in hook_name:
-        return "PostToolUse"
-    elif "prompt" in hook_name or "user-prompt" in hook_name:
-        return "UserPromptSubmit"
-    elif "session-start" in hook_name:
-        return "SessionStart"
-    elif "session-end" in hook_name:
-        return "SessionEnd"
-    elif "subagent-stop" in hook_name or "subagent" in hook_name:
-        return "SubagentStop"
-    else:
-        # Default to PreToolUse for safety
-        print(
-            f"  ⚠ No event type detected for {hook_path.name}, defaulting to PreToolUse"
-        )
-        return "PreToolUse"
+                    # Extract event type, removing any trailing comment characters
+                    event_type = line.split("CLAUDE_HOOK_EVENT:", 1)[1]
+                    return event_type.strip().rstrip("*/-#").strip()
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    print(f"  ⚠ No CLAUDE_HOOK_EVENT header in {hook_path.name}, defaulting to PreToolUse")
+    return "PreToolUse"
 
 
 def update_settings(deployed_hooks):
@@ -130,11 +132,11 @@ def update_settings(deployed_hooks):
     # Map hook files to their appropriate event types
     hook_configs = {}
 
-    for hook_path in deployed_hooks:
+    for hook_path, source_path in deployed_hooks:
         hook_name = hook_path.stem  # filename without extension
 
-        # Detect event type
-        event_type = detect_hook_event_type(hook_path)
+        # Detect event type (from the script, since native builds have no header)
+        event_type = detect_hook_event_type(source_path)
 
         # Register the hook
         if event_type not in hook_configs:
@@ -156,10 +158,18 @@ def update_settings(deployed_hooks):
 
         hooks_array = settings["hooks"][event_type][0].get("hooks", [])
 
-        # Remove existing entries for these hooks (to avoid duplicates)
+        # Remove existing entries for these hooks (to avoid duplicates),
+        # including a script/native variant deployed under the same name
         existing_commands = {h["command"] for h in new_hooks}
+        existing_names = {h["name"] for h in new_hooks}
         hooks_array = [
-            h for h in hooks_array if h.get("command") not in existing_commands
+            h
+            for h in hooks_array
+            if h.get("command") not in existing_commands
+            and not (
+                h.get("name") in existing_names
+                and Path(h.get("command", "")).parent == CLAUDE_HOOKS_DIR
+            )
         ]
 
         # Add new hooks
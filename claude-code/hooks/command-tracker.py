@@ -11,78 +11,68 @@ Captures detailed information about every tool execution:
 - Success/failure status
 
 Creates a comprehensive analytics database for understanding your workflow.
+
+Each call is appended as one JSON line to tool_calls.ndjson; session-tracker
+loads the queued lines into tool_calls.db in a single transaction at SessionEnd.
 """
 
-import json
 import sys
-import sqlite3
 import os
-from datetime import datetime
-from pathlib import Path
+import time
+import fcntl
+
+from hooks_common import dumps, read_input
 
-# Database path
-DB_PATH = os.path.expanduser("~/.claude/analytics/tool_calls.db")
+# Event log path (drained into ~/.claude/analytics/tool_calls.db by session-tracker)
+LOG_PATH = os.path.expanduser("~/.claude/analytics/tool_calls.ndjson")
 
-# Ensure directory exists
-os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+def open_log():
+    """Open the live event log under a shared lock, retrying if it was just rotated."""
+    while True:
+        try:
+            fd = os.open(LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            # First run: create the analytics directory, then retry
+            os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+            continue
+
+        # session-tracker rotates the log while holding an exclusive lock, so once
+        # ours is granted the file is only safe to write if it is still LOG_PATH
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        try:
+            if os.path.samestat(os.fstat(fd), os.stat(LOG_PATH)):
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
 
 # Read hook input
-input_data = json.load(sys.stdin)
+input_data = read_input()
 
 # Extract data
 tool_name = input_data.get("tool_name", "unknown")
 tool_input = input_data.get("tool_input", {})
 session_id = os.getenv("CLAUDE_SESSION_ID", "unknown")
 
-# Extract specific fields based on tool type
-file_path = tool_input.get("file_path")
-command = tool_input.get("command")
-pattern = tool_input.get("pattern")  # For Grep
-description = tool_input.get("description")
-
-# Initialize database
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
-
-# Create table if not exists
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS tool_calls (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        session_id TEXT NOT NULL,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-        tool_type TEXT NOT NULL,
-        file_path TEXT,
-        command TEXT,
-        pattern TEXT,
-        description TEXT,
-        params_json TEXT,
-        success BOOLEAN DEFAULT 1
-    )
-""")
-
-# Create indexes for fast queries
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_session ON tool_calls(session_id)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON tool_calls(timestamp)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_tool_type ON tool_calls(tool_type)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON tool_calls(file_path) WHERE file_path IS NOT NULL")
-
-# Insert tool call
-cursor.execute("""
-    INSERT INTO tool_calls (
-        session_id, tool_type, file_path, command, pattern, description, params_json
-    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-""", (
-    session_id,
-    tool_name,
-    file_path,
-    command,
-    pattern,
-    description,
-    json.dumps(tool_input)
-))
+# Record the tool call (timestamp matches SQLite's CURRENT_TIMESTAMP format)
+record = {
+    "session_id": session_id,
+    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+    "tool_type": tool_name,
+    "file_path": tool_input.get("file_path"),
+    "command": tool_input.get("command"),
+    "pattern": tool_input.get("pattern"),  # For Grep
+    "description": tool_input.get("description"),
+    "params": tool_input,
+}
 
-conn.commit()
-conn.close()
+# Append as a single write(2) so concurrent hooks never interleave lines
+line = dumps(record) + b"\n"
+fd = open_log()
+try:
+    os.write(fd, line)
+finally:
+    os.close(fd)
 
 # Optional: Print confirmation (comment out if too verbose)
 # print(f"[tool-tracker] Logged {tool_name} call to database", file=sys.stderr)
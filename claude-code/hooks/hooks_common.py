@@ -0,0 +1,34 @@
+"""
+Shared helpers for the hook scripts in this directory.
+
+Deployed alongside the hooks (but not registered as one). Uses orjson when it
+is installed and falls back to the stdlib json module otherwise, so hooks keep
+working with no third-party dependencies.
+"""
+
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Serialize obj to UTF-8 encoded JSON bytes."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def read_input():
+    """Read the hook's JSON payload from stdin without a text decoding pass."""
+    return loads(sys.stdin.buffer.read())
@@ -0,0 +1,63 @@
+"""
+SQLite helpers shared by the analytics hooks (session and subagent trackers).
+
+Deployed alongside the hooks (but not registered as one). Follows SQLite's
+one-writer / many-readers model under WAL: writes go through a single
+autocommit connection per process, with sibling databases attached to it, and
+queries (such as analytics dashboards) can use read-only connections that never
+take the write lock, so readers and the writer don't block each other.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def open_db(path):
+    """Open the writer connection: WAL mode, relaxed sync, explicit transactions."""
+    conn = sqlite3.connect(path, isolation_level=None, timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    return conn
+
+
+def open_readonly_db(path):
+    """Open a read-only connection for queries (the database must already exist)."""
+    uri = f"{Path(path).as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None, timeout=5.0)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def attach_db(conn, path, name):
+    """Attach another database to a writer connection under schema ``name``."""
+    conn.execute(f"ATTACH DATABASE ? AS {name}", (path,))
+    # journal_mode, synchronous and cache_size are per-schema, so repeat them here
+    conn.execute(f"PRAGMA {name}.journal_mode=WAL")
+    conn.execute(f"PRAGMA {name}.synchronous=NORMAL")
+    conn.execute(f"PRAGMA {name}.cache_size=-64000")
+
+
+@contextmanager
+def immediate_transaction(db):
+    """
+    Run a block of writes inside BEGIN IMMEDIATE ... COMMIT.
+
+    Taking the write lock up front means a deferred transaction never has to
+    upgrade mid-statement (and fail with SQLITE_BUSY); contending writers wait
+    on busy_timeout instead. Rolls back if the block or the COMMIT raises, so
+    the connection is never left inside an open transaction.
+    """
+    conn = getattr(db, "connection", db)  # Accept a cursor or a connection
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        db.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            db.execute("ROLLBACK")
+        raise
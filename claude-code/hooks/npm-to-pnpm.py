@@ -5,8 +5,93 @@ import json
 import sys
 import re
 
-# Read hook input
-input_data = json.load(sys.stdin)
+from hooks_common import loads
+
+# npm as a standalone command
+NPM_RE = re.compile(r'\bnpm\b')
+
+# Shell tokens: operators (including fd redirections such as 2>&1, so the 2 is
+# not read as a word) or words with their quoting kept intact
+TOKEN_RE = re.compile(
+    r'''(?P<operator>\d*[<>]+&?\d*-?|[;&|()<>\n]+)'''
+    r'''|(?P<word>(?:[^\s'"\\;&|()<>]+|'[^']*'|"(?:\\.|[^"\\])*"|\\.)+)'''
+)
+
+# npm options whose value is the next argument (npm install --registry <url>)
+VALUE_OPTIONS = {
+    '--registry', '--prefix', '-C', '--loglevel', '--cache', '--tag', '--omit',
+    '--include', '--workspace', '-w', '--userconfig', '--globalconfig',
+    '--location', '--install-strategy', '--before', '--otp', '--scope',
+}
+
+# npm subcommands that are spelled differently in pnpm
+SUBCOMMANDS = {
+    'install': 'add',
+    'i': 'add',
+    'uninstall': 'remove',
+    'un': 'remove',
+}
+
+
+def has_package_spec(args):
+    """Whether npm install args name a package (option values don't count)."""
+    args = iter(args)
+    for arg in args:
+        if arg in VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return True
+    return False
+
+
+def convert(command):
+    """Rewrite every npm invocation in command in a single pass over its tokens."""
+    tokens = [(m.group(), m.lastgroup, m.start(), m.end()) for m in TOKEN_RE.finditer(command)]
+    parts = []
+    last = 0
+    i = 0
+    while i < len(tokens):
+        text, kind, start, end = tokens[i]
+        i += 1
+        if kind != 'word' or text != 'npm':
+            continue
+
+        parts.append(command[last:start])
+        parts.append('pnpm')
+        last = end
+
+        if i >= len(tokens) or tokens[i][1] != 'word' or tokens[i][0] not in SUBCOMMANDS:
+            continue
+
+        # Collect this invocation's arguments (up to the next shell operator)
+        subcommand, _, sub_start, sub_end = tokens[i]
+        args = []
+        for arg, arg_kind, _, _ in tokens[i + 1:]:
+            if arg_kind == 'operator':
+                break
+            args.append(arg)
+
+        replacement = SUBCOMMANDS[subcommand]
+        if replacement == 'add':
+            # npm install (no packages) -> pnpm install
+            # npm install <package> / -g <package> -> pnpm add ...
+            if not has_package_spec(args) and '-g' not in args and '--global' not in args:
+                replacement = 'install'
+
+        parts.append(command[last:sub_start])
+        parts.append(replacement)
+        last = sub_end
+        i += 1
+
+    parts.append(command[last:])
+    return ''.join(parts)
+
+
+# Read hook input, skipping the JSON parse when npm can't appear anywhere in it
+raw_input = sys.stdin.buffer.read()
+if b"npm" not in raw_input:
+    sys.exit(0)
+input_data = loads(raw_input)
 
 # Only process Bash commands
 if input_data.get("tool_name") != "Bash":
@@ -17,31 +102,13 @@ tool_input = input_data.get("tool_input", {})
 command = tool_input.get("command", "")
 
 # Check if command contains npm (as a standalone command)
-if not re.search(r'\bnpm\b', command):
+if not NPM_RE.search(command):
     sys.exit(0)
 
 # Convert npm commands to pnpm equivalents
-new_command = command
-
-# Handle special cases first (order matters!)
-# npm install <package> -> pnpm add <package>
-new_command = re.sub(r'\bnpm\s+install\s+(?!$)(?!-)', 'pnpm add ', new_command)
-new_command = re.sub(r'\bnpm\s+i\s+(?!$)(?!-)', 'pnpm add ', new_command)
-
-# npm install -g <package> -> pnpm add -g <package>
-new_command = re.sub(r'\bnpm\s+install\s+-g\b', 'pnpm add -g', new_command)
-new_command = re.sub(r'\bnpm\s+i\s+-g\b', 'pnpm add -g', new_command)
-
-# npm uninstall -> pnpm remove
-new_command = re.sub(r'\bnpm\s+uninstall\b', 'pnpm remove', new_command)
-new_command = re.sub(r'\bnpm\s+un\b', 'pnpm remove', new_command)
-
-# npm install (no args) -> pnpm install
-new_command = re.sub(r'\bnpm\s+install\s*$', 'pnpm install', new_command)
-new_command = re.sub(r'\bnpm\s+i\s*$', 'pnpm install', new_command)
-
-# All other npm commands -> pnpm (run, test, start, build, etc.)
-new_command = re.sub(r'\bnpm\b', 'pnpm', new_command)
+new_command = convert(command)
+if new_command == command:
+    sys.exit(0)
 
 # Output the modified command
 output = {
@@ -12,29 +12,130 @@ Captures:
 Creates a historical record of all coding sessions for analytics.
 """
 
-import json
 import sys
-import sqlite3
 import os
-from datetime import datetime
-from pathlib import Path
+import glob
+import time
+import fcntl
+
+from hooks_common import dumps, loads, read_input
+from hooks_db import attach_db, immediate_transaction, open_db
 
 # Database paths
 SESSIONS_DB = os.path.expanduser("~/.claude/analytics/sessions.db")
 TOOL_CALLS_DB = os.path.expanduser("~/.claude/analytics/tool_calls.db")
+TOOL_CALLS_LOG = os.path.expanduser("~/.claude/analytics/tool_calls.ndjson")
+TOOL_CALLS_DRAIN_LOCK = os.path.expanduser("~/.claude/analytics/tool_calls.drain.lock")
+
+# Bump when the tool_calls CREATE statements below change
+TOOL_CALLS_SCHEMA_VERSION = 2
 
 # Ensure directory exists
 os.makedirs(os.path.dirname(SESSIONS_DB), exist_ok=True)
 
+def ensure_tool_calls_schema(cursor):
+    """Create tc.tool_calls on first use (tracked via tc's user_version)."""
+    cursor.execute("PRAGMA tc.user_version")
+    if cursor.fetchone()[0] >= TOOL_CALLS_SCHEMA_VERSION:
+        return
+
+    with immediate_transaction(cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tc.tool_calls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                tool_type TEXT NOT NULL,
+                file_path TEXT,
+                command TEXT,
+                pattern TEXT,
+                description TEXT,
+                params_json TEXT,
+                success BOOLEAN DEFAULT 1
+            )
+        """)
+
+        # Create indexes for fast queries
+        # idx_session_cover answers the per-session stats query from the index alone
+        # (its session_id prefix replaces the old single-column idx_session)
+        cursor.execute("CREATE INDEX IF NOT EXISTS tc.idx_session_cover ON tool_calls(session_id, tool_type, file_path, timestamp)")
+        cursor.execute("DROP INDEX IF EXISTS tc.idx_session")
+        cursor.execute("CREATE INDEX IF NOT EXISTS tc.idx_timestamp ON tool_calls(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS tc.idx_tool_type ON tool_calls(tool_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS tc.idx_file_path ON tool_calls(file_path) WHERE file_path IS NOT NULL")
+
+        cursor.execute(f"PRAGMA tc.user_version = {TOOL_CALLS_SCHEMA_VERSION}")
+
+def drain_tool_calls_log(cursor):
+    """Bulk-load the events queued by command-tracker, returning the row count."""
+    # Serialize drains on a lock file outside the tool_calls.ndjson.* glob, so claimed
+    # files can stay on disk until COMMIT without a second drain re-importing them
+    lock_fd = os.open(TOOL_CALLS_DRAIN_LOCK, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+
+        # Move the live log aside; command-tracker starts a fresh one on its next call.
+        # The exclusive lock waits out in-flight appends, and writers that lock the
+        # old file afterwards notice it was moved and reopen LOG_PATH instead.
+        try:
+            log_fd = os.open(TOOL_CALLS_LOG, os.O_RDONLY)
+        except FileNotFoundError:
+            log_fd = None
+        if log_fd is not None:
+            try:
+                fcntl.flock(log_fd, fcntl.LOCK_EX)
+                # pid plus time_ns, so a reused pid can't overwrite an unloaded leftover
+                os.replace(TOOL_CALLS_LOG, f"{TOOL_CALLS_LOG}.{os.getpid()}.{time.time_ns()}")
+            finally:
+                os.close(log_fd)
+
+        # Also picks up files left behind by a drain that was interrupted
+        pending = glob.glob(f"{glob.escape(TOOL_CALLS_LOG)}.*")
+
+        rows = []
+        for path in pending:
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        event = loads(line)
+                    except ValueError:
+                        continue  # Skip a truncated trailing line
+                    rows.append((
+                        event.get("session_id", "unknown"),
+                        event.get("timestamp"),
+                        event.get("tool_type", "unknown"),
+                        event.get("file_path"),
+                        event.get("command"),
+                        event.get("pattern"),
+                        event.get("description"),
+                        dumps(event.get("params", {})).decode()
+                    ))
+
+        with immediate_transaction(cursor):
+            cursor.executemany("""
+                INSERT INTO tc.tool_calls (
+                    session_id, timestamp, tool_type, file_path, command, pattern, description, params_json
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+        # Only delete once committed: a crash here re-imports the files, never loses them
+        for path in pending:
+            os.remove(path)
+    finally:
+        os.close(lock_fd)
+
+    return len(rows)
+
 # Read hook input
-input_data = json.load(sys.stdin)
+input_data = read_input()
 
 # Extract session data
 session_id = os.getenv("CLAUDE_SESSION_ID", "unknown")
 model = os.getenv("CLAUDE_MODEL", "unknown")
 
-# Initialize database
-conn = sqlite3.connect(SESSIONS_DB)
+# Initialize database (tool_calls.db shares the connection as schema "tc")
+conn = open_db(SESSIONS_DB)
+attach_db(conn, TOOL_CALLS_DB, "tc")
 cursor = conn.cursor()
 
 # Create table if not exists
@@ -58,39 +159,23 @@ command_count = 0
 duration_seconds = 0
 
 try:
-    tool_conn = sqlite3.connect(TOOL_CALLS_DB)
-    tool_cursor = tool_conn.cursor()
-
-    # Count total tools used
-    tool_cursor.execute("""
-        SELECT COUNT(*) FROM tool_calls WHERE session_id = ?
-    """, (session_id,))
-    tool_count = tool_cursor.fetchone()[0]
-
-    # Count unique files modified
-    tool_cursor.execute("""
-        SELECT COUNT(DISTINCT file_path) FROM tool_calls
-        WHERE session_id = ? AND file_path IS NOT NULL
-    """, (session_id,))
-    file_count = tool_cursor.fetchone()[0]
-
-    # Count bash commands
-    tool_cursor.execute("""
-        SELECT COUNT(*) FROM tool_calls
-        WHERE session_id = ? AND tool_type = 'Bash'
-    """, (session_id,))
-    command_count = tool_cursor.fetchone()[0]
+    # Load queued tool calls before counting them
+    ensure_tool_calls_schema(cursor)
+    drain_tool_calls_log(cursor)
 
-    # Calculate session duration
-    tool_cursor.execute("""
+    # Tool, unique file and bash command counts plus duration, in one pass
+    # (an autocommit read, so it takes no write lock)
+    cursor.execute("""
         SELECT
+            COUNT(*),
+            COUNT(DISTINCT file_path),
+            SUM(tool_type = 'Bash'),
             CAST((julianday(MAX(timestamp)) - julianday(MIN(timestamp))) * 24 * 60 * 60 AS INTEGER)
-        FROM tool_calls WHERE session_id = ?
+        FROM tc.tool_calls WHERE session_id = ?
     """, (session_id,))
-    result = tool_cursor.fetchone()
-    duration_seconds = result[0] if result[0] else 0
-
-    tool_conn.close()
+    tool_count, file_count, command_count, duration_seconds = cursor.fetchone()
+    command_count = command_count or 0
+    duration_seconds = duration_seconds or 0
 except Exception as e:
     print(f"[session-tracker] Warning: Could not get tool stats: {e}", file=sys.stderr)
 
@@ -98,21 +183,21 @@ except Exception as e:
 summary = f"Session completed: {tool_count} tools, {file_count} files, {command_count} commands"
 
 # Insert session record
-cursor.execute("""
-    INSERT OR REPLACE INTO sessions (
-        id, model, summary, tool_count, file_count, command_count, duration_seconds
-    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-""", (
-    session_id,
-    model,
-    summary,
-    tool_count,
-    file_count,
-    command_count,
-    duration_seconds
-))
-
-conn.commit()
+with immediate_transaction(cursor):
+    cursor.execute("""
+        INSERT OR REPLACE INTO sessions (
+            id, model, summary, tool_count, file_count, command_count, duration_seconds
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (
+        session_id,
+        model,
+        summary,
+        tool_count,
+        file_count,
+        command_count,
+        duration_seconds
+    ))
+
 conn.close()
 
 print(f"[session-tracker] Session data saved: {summary}", file=sys.stderr)
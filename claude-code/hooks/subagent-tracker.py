@@ -14,21 +14,23 @@ Creates analytics for multi-agent workflows.
 Note: This is Claude Code exclusive (no OpenCode equivalent).
 """
 
-import json
 import sys
-import sqlite3
 import os
-from datetime import datetime
-from pathlib import Path
+
+from hooks_common import dumps, read_input
+from hooks_db import immediate_transaction, open_db
 
 # Database path
 DB_PATH = os.path.expanduser("~/.claude/analytics/subagent_sessions.db")
 
+# Bump when the CREATE statements below change
+SCHEMA_VERSION = 1
+
 # Ensure directory exists
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
 # Read hook input
-input_data = json.load(sys.stdin)
+input_data = read_input()
 
 # Extract data
 session_id = os.getenv("CLAUDE_SESSION_ID", "unknown")
@@ -37,41 +39,46 @@ summary = input_data.get("summary", "")
 files_modified = input_data.get("files_modified", [])
 
 # Initialize database
-conn = sqlite3.connect(DB_PATH)
+conn = open_db(DB_PATH)
 cursor = conn.cursor()
 
-# Create table if not exists
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS subagent_sessions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        parent_session_id TEXT NOT NULL,
-        subagent_type TEXT NOT NULL,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-        summary TEXT,
-        files_modified_json TEXT,
-        file_count INTEGER DEFAULT 0
-    )
-""")
-
-# Create indexes
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_parent_session ON subagent_sessions(parent_session_id)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_subagent_type ON subagent_sessions(subagent_type)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON subagent_sessions(timestamp)")
+# Create schema on first run only (user_version records what has been applied)
+cursor.execute("PRAGMA user_version")
+if cursor.fetchone()[0] < SCHEMA_VERSION:
+    with immediate_transaction(cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS subagent_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                parent_session_id TEXT NOT NULL,
+                subagent_type TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                summary TEXT,
+                files_modified_json TEXT,
+                file_count INTEGER DEFAULT 0
+            )
+        """)
+
+        # Create indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_parent_session ON subagent_sessions(parent_session_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_subagent_type ON subagent_sessions(subagent_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON subagent_sessions(timestamp)")
+
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 # Insert subagent session
-cursor.execute("""
-    INSERT INTO subagent_sessions (
-        parent_session_id, subagent_type, summary, files_modified_json, file_count
-    ) VALUES (?, ?, ?, ?, ?)
-""", (
-    session_id,
-    subagent_type,
-    summary,
-    json.dumps(files_modified),
-    len(files_modified)
-))
-
-conn.commit()
+with immediate_transaction(cursor):
+    cursor.execute("""
+        INSERT INTO subagent_sessions (
+            parent_session_id, subagent_type, summary, files_modified_json, file_count
+        ) VALUES (?, ?, ?, ?, ?)
+    """, (
+        session_id,
+        subagent_type,
+        summary,
+        dumps(files_modified).decode(),
+        len(files_modified)
+    ))
+
 conn.close()
 
 print(f"[subagent-tracker] Tracked {subagent_type} subagent: {len(files_modified)} files", file=sys.stderr)
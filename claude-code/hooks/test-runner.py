@@ -25,12 +25,18 @@ Test file detection patterns:
 import json
 import sys
 import os
-import subprocess
 import re
-from pathlib import Path
+
+from hooks_common import loads, read_input
+
+# Cached package.json scan results, invalidated by manifest mtime
+FRAMEWORK_CACHE = os.path.expanduser("~/.claude/analytics/framework_cache.json")
+
+# One comma-separated entry of CLAUDE_FILE_PATHS, without surrounding whitespace
+PATHS_RE = re.compile(r'[^,\s][^,]*(?<!\s)')
 
 # Read hook input
-input_data = json.load(sys.stdin)
+input_data = read_input()
 
 # Only process Edit and Write tools
 tool_name = input_data.get("tool_name", "")
@@ -42,24 +48,74 @@ file_paths_str = os.getenv("CLAUDE_FILE_PATHS", "")
 if not file_paths_str:
     sys.exit(0)
 
-file_paths = [p.strip() for p in file_paths_str.split(",") if p.strip()]
+file_paths = PATHS_RE.findall(file_paths_str)
 
-# Test file patterns
-TEST_PATTERNS = {
-    'python': [r'test_.*\.py$', r'.*_test\.py$'],
-    'javascript': [r'.*\.test\.(js|ts|jsx|tsx)$', r'.*\.spec\.(js|ts|jsx|tsx)$'],
-    'go': [r'.*_test\.go$'],
-    'rust': [r'tests/.*\.rs$']
-}
+# Test file patterns, one named group per language (matched in a single search)
+TEST_FILE_RE = re.compile(
+    r'(?P<python>test_.*\.py$|.*_test\.py$)'
+    r'|(?P<javascript>.*\.test\.(?:js|ts|jsx|tsx)$|.*\.spec\.(?:js|ts|jsx|tsx)$)'
+    r'|(?P<go>.*_test\.go$)'
+    r'|(?P<rust>tests/.*\.rs$)'
+)
 
 def is_test_file(file_path):
     """Check if file is a test file."""
-    for language, patterns in TEST_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, file_path):
-                return True, language
+    match = TEST_FILE_RE.search(file_path)
+    if match:
+        return True, match.lastgroup
     return False, None
 
+def load_framework_cache():
+    """Load cached package.json scan results ({path: {mtime_ns, has_test}})."""
+    try:
+        with open(FRAMEWORK_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_framework_cache(cache):
+    """Persist the cache atomically (write a temp file, then rename over)."""
+    try:
+        os.makedirs(os.path.dirname(FRAMEWORK_CACHE), exist_ok=True)
+        tmp_path = f"{FRAMEWORK_CACHE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, FRAMEWORK_CACHE)
+    except OSError:
+        pass  # Caching is best-effort
+
+def has_npm_test_script(package_json):
+    """
+    Check whether package.json defines scripts.test.
+
+    Returns None when there is no readable package.json. The parse result is
+    cached by the manifest's mtime, so unchanged manifests cost a single stat().
+    """
+    try:
+        mtime_ns = os.stat(package_json).st_mtime_ns
+    except OSError:
+        return None
+
+    cache = load_framework_cache()
+    entry = cache.get(package_json)
+    if entry and entry.get('mtime_ns') == mtime_ns:
+        return entry['has_test']
+
+    try:
+        with open(package_json, 'rb') as f:
+            raw = f.read()
+        # Cheap byte scan first: only build the full document if both keys can be there
+        if b'"scripts"' not in raw or b'"test"' not in raw:
+            has_test = False
+        else:
+            has_test = 'test' in (loads(raw).get('scripts') or {})
+    except (OSError, ValueError, AttributeError):
+        return None
+
+    cache[package_json] = {'mtime_ns': mtime_ns, 'has_test': has_test}
+    save_framework_cache(cache)
+    return has_test
+
 def detect_test_framework(language, project_dir):
     """Detect which test framework to use."""
     if language == 'python':
@@ -72,15 +128,8 @@ def detect_test_framework(language, project_dir):
     elif language == 'javascript':
         # Check package.json for test script
         package_json = os.path.join(project_dir, 'package.json')
-        if os.path.exists(package_json):
-            try:
-                with open(package_json) as f:
-                    import json as json_lib
-                    data = json_lib.load(f)
-                    if 'scripts' in data and 'test' in data['scripts']:
-                        return 'npm test'
-            except:
-                pass
+        if has_npm_test_script(package_json) is False:
+            return None
         return 'npm test'
 
     elif language == 'go':
@@ -91,31 +140,45 @@ def detect_test_framework(language, project_dir):
 
     return None
 
+# Argument lists for each detected framework (run without a shell)
+TEST_COMMANDS = {
+    'pytest': ['pytest'],
+    'python -m unittest': ['python', '-m', 'unittest'],
+    'npm test': ['npm', 'test'],
+    'go test': ['go', 'test'],
+    'cargo test': ['cargo', 'test'],
+}
+
 def run_tests(test_command, test_files, project_dir):
     """Run tests and return results."""
+    # Only needed once a test file has been edited; keep them off the early-exit path
+    import shutil
+    import subprocess
+
     print(f"\n[test-runner] Running tests: {test_command}", file=sys.stderr)
 
     # Determine scope
+    cmd = TEST_COMMANDS[test_command]
     if len(test_files) <= 3:
         # Run specific test files
-        if 'pytest' in test_command:
-            cmd = f"cd {project_dir} && pytest {' '.join(test_files)} -v"
-        elif 'npm test' in test_command:
-            cmd = f"cd {project_dir} && npm test -- --testPathPattern=\"{test_files[0]}\""
-        elif 'go test' in test_command:
-            cmd = f"cd {project_dir} && go test -v {' '.join(test_files)}"
-        elif 'cargo test' in test_command:
-            cmd = f"cd {project_dir} && cargo test"
-        else:
-            cmd = f"cd {project_dir} && {test_command}"
-    else:
-        # Run full test suite
-        cmd = f"cd {project_dir} && {test_command}"
+        if test_command == 'pytest':
+            cmd = [*cmd, *test_files, '-v']
+        elif test_command == 'npm test':
+            cmd = [*cmd, '--', f'--testPathPattern={test_files[0]}']
+        elif test_command == 'go test':
+            cmd = [*cmd, '-v', *test_files]
+    # Otherwise run the full test suite
+
+    # Resolve the executable up front for a clear message when it's missing
+    executable = shutil.which(cmd[0])
+    if executable is None:
+        print(f"[test-runner] ⚠️  {cmd[0]} not found on PATH", file=sys.stderr)
+        return
 
     try:
         result = subprocess.run(
-            cmd,
-            shell=True,
+            [executable, *cmd[1:]],
+            cwd=project_dir,
             capture_output=True,
             text=True,
             timeout=120  # 2 minute timeout
@@ -17,16 +17,16 @@ Appends to TODOS_AUTOGENERATED.md with:
 Keeps your manual TODOS.md separate - this is auto-generated!
 """
 
-import json
 import sys
 import os
 import re
 from datetime import datetime
-from pathlib import Path
 from collections import defaultdict
 
+from hooks_common import read_input
+
 # Read hook input
-input_data = json.load(sys.stdin)
+input_data = read_input()
 
 # Only process Edit and Write tools
 tool_name = input_data.get("tool_name", "")
@@ -0,0 +1,57 @@
+// CLAUDE_HOOK_EVENT: PreToolUse
+//! Native build of hooks/grep-to-rg.py: convert grep commands to ripgrep (rg).
+//!
+//! Behaves exactly like the Python hook, without paying interpreter startup
+//! on every Bash command.
+
+use std::io::{self, Read};
+use std::process::ExitCode;
+use std::sync::LazyLock;
+
+use regex::Regex;
+use serde_json::{json, Value};
+
+// grep as a standalone word (leaves egrep, grepdiff, grep_results.txt alone)
+static GREP_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"\bgrep\b").unwrap());
+
+fn main() -> ExitCode {
+    // Read hook input, skipping the JSON parse when grep can't appear anywhere in it
+    let mut raw = String::new();
+    if let Err(e) = io::stdin().read_to_string(&mut raw) {
+        eprintln!("[grep-to-rg] Could not read input: {e}");
+        return ExitCode::FAILURE;
+    }
+    if !raw.contains("grep") {
+        return ExitCode::SUCCESS;
+    }
+    let input_data: Value = match serde_json::from_str(&raw) {
+        Ok(value) => value,
+        Err(e) => {
+            eprintln!("[grep-to-rg] Invalid hook input: {e}");
+            return ExitCode::FAILURE;
+        }
+    };
+
+    // Only process Bash commands
+    if input_data["tool_name"] != "Bash" {
+        return ExitCode::SUCCESS;
+    }
+
+    // Get the command
+    let command = input_data["tool_input"]["command"].as_str().unwrap_or("");
+
+    // Replace grep with rg
+    if GREP_RE.is_match(command) {
+        let new_command = GREP_RE.replace_all(command, "rg");
+        let output = json!({
+            "hookSpecificOutput": {
+                "hookEventName": "PreToolUse",
+                "permissionDecision": "allow",
+                "updatedInput": {"command": new_command},
+            }
+        });
+        println!("{output}");
+    }
+
+    ExitCode::SUCCESS
+}
@@ -0,0 +1,167 @@
+// CLAUDE_HOOK_EVENT: PreToolUse
+//! Native build of hooks/npm-to-pnpm.py: convert npm commands to pnpm.
+//!
+//! Uses the same single-pass token walk as the Python hook, so both produce
+//! identical rewrites.
+
+use std::io::{self, Read};
+use std::process::ExitCode;
+use std::sync::LazyLock;
+
+use regex::Regex;
+use serde_json::{json, Value};
+
+// npm as a standalone command
+static NPM_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"\bnpm\b").unwrap());
+
+// Shell tokens: operators (including fd redirections such as 2>&1, so the 2 is
+// not read as a word) or words with their quoting kept intact
+static TOKEN_RE: LazyLock<Regex> = LazyLock::new(|| {
+    Regex::new(concat!(
+        r#"(?P<operator>\d*[<>]+&?\d*-?|[;&|()<>\n]+)"#,
+        r#"|(?P<word>(?:[^\s'"\\;&|()<>]+|'[^']*'|"(?:\\.|[^"\\])*"|\\.)+)"#,
+    ))
+    .unwrap()
+});
+
+// npm options whose value is the next argument (npm install --registry <url>)
+const VALUE_OPTIONS: &[&str] = &[
+    "--registry", "--prefix", "-C", "--loglevel", "--cache", "--tag", "--omit",
+    "--include", "--workspace", "-w", "--userconfig", "--globalconfig",
+    "--location", "--install-strategy", "--before", "--otp", "--scope",
+];
+
+/// A shell token and whether it is an operator rather than a word.
+struct Token<'a> {
+    text: &'a str,
+    operator: bool,
+    start: usize,
+    end: usize,
+}
+
+/// npm subcommands that are spelled differently in pnpm.
+fn pnpm_subcommand(subcommand: &str) -> Option<&'static str> {
+    match subcommand {
+        "install" | "i" => Some("add"),
+        "uninstall" | "un" => Some("remove"),
+        _ => None,
+    }
+}
+
+/// Whether npm install `args` name a package (option values don't count).
+fn has_package_spec(args: &[&str]) -> bool {
+    let mut args = args.iter();
+    while let Some(arg) = args.next() {
+        if VALUE_OPTIONS.contains(arg) {
+            args.next();
+        } else if !arg.starts_with('-') {
+            return true;
+        }
+    }
+    false
+}
+
+/// Rewrite every npm invocation in `command` in a single pass over its tokens.
+fn convert(command: &str) -> String {
+    let tokens: Vec<Token> = TOKEN_RE
+        .captures_iter(command)
+        .map(|caps| {
+            let m = caps.get(0).unwrap();
+            Token {
+                text: m.as_str(),
+                operator: caps.name("operator").is_some(),
+                start: m.start(),
+                end: m.end(),
+            }
+        })
+        .collect();
+    let mut out = String::with_capacity(command.len() + 16);
+    let mut last = 0;
+    let mut i = 0;
+    while i < tokens.len() {
+        let token = &tokens[i];
+        i += 1;
+        if token.operator || token.text != "npm" {
+            continue;
+        }
+
+        out.push_str(&command[last..token.start]);
+        out.push_str("pnpm");
+        last = token.end;
+
+        let Some(subcommand) = tokens.get(i).filter(|t| !t.operator) else { continue };
+        let Some(mut replacement) = pnpm_subcommand(subcommand.text) else { continue };
+
+        // Collect this invocation's arguments (up to the next shell operator)
+        let args: Vec<&str> = tokens[i + 1..]
+            .iter()
+            .take_while(|arg| !arg.operator)
+            .map(|arg| arg.text)
+            .collect();
+
+        if replacement == "add" {
+            // npm install (no packages) -> pnpm install
+            // npm install <package> / -g <package> -> pnpm add ...
+            if !has_package_spec(&args) && !args.contains(&"-g") && !args.contains(&"--global") {
+                replacement = "install";
+            }
+        }
+
+        out.push_str(&command[last..subcommand.start]);
+        out.push_str(replacement);
+        last = subcommand.end;
+        i += 1;
+    }
+
+    out.push_str(&command[last..]);
+    out
+}
+
+fn main() -> ExitCode {
+    // Read hook input, skipping the JSON parse when npm can't appear anywhere in it
+    let mut raw = String::new();
+    if let Err(e) = io::stdin().read_to_string(&mut raw) {
+        eprintln!("[npm-to-pnpm] Could not read input: {e}");
+        return ExitCode::FAILURE;
+    }
+    if !raw.contains("npm") {
+        return ExitCode::SUCCESS;
+    }
+    let input_data: Value = match serde_json::from_str(&raw) {
+        Ok(value) => value,
+        Err(e) => {
+            eprintln!("[npm-to-pnpm] Invalid hook input: {e}");
+            return ExitCode::FAILURE;
+        }
+    };
+
+    // Only process Bash commands
+    if input_data["tool_name"] != "Bash" {
+        return ExitCode::SUCCESS;
+    }
+
+    // Get the command
+    let command = input_data["tool_input"]["command"].as_str().unwrap_or("");
+
+    // Check if command contains npm (as a standalone command)
+    if !NPM_RE.is_match(command) {
+        return ExitCode::SUCCESS;
+    }
+
+    // Convert npm commands to pnpm equivalents
+    let new_command = convert(command);
+    if new_command == command {
+        return ExitCode::SUCCESS;
+    }
+
+    // Output the modified command
+    let output = json!({
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "allow",
+            "updatedInput": {"command": new_command},
+        }
+    });
+    println!("{output}");
+    ExitCode::SUCCESS
+}
@@ -3,9 +3,16 @@
 """Hook to automatically convert grep commands to ripgrep (rg) for better performance."""
 import json
 import sys
+import re
 
-# Read hook input
-input_data = json.load(sys.stdin)
+# grep as a standalone word (leaves egrep, grepdiff, grep_results.txt alone)
+GREP_RE = re.compile(r'\bgrep\b')
+
+# Read hook input, skipping the JSON parse when grep can't appear anywhere in it
+raw_input = sys.stdin.buffer.read()
+if b"grep" not in raw_input:
+    sys.exit(0)
+input_data = json.loads(raw_input)
 
 # Only process Bash commands
 if input_data.get("tool_name") != "Bash":
@@ -16,9 +23,8 @@ tool_input = input_data.get("tool_input", {})
 command = tool_input.get("command", "")
 
 # Replace grep with rg
-if "grep" in command:
-    new_command = command.replace("grep", "rg")
-
+new_command, replaced = GREP_RE.subn("rg", command)
+if replaced:
     output = {
         "hookSpecificOutput": {
             "hookEventName": "PreToolUse",
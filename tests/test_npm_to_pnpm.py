@@ -0,0 +1,69 @@
+"""Regression tests for the npm-to-pnpm hook's command rewriting."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CLAUDE_CODE = Path(__file__).parent.parent / "claude-code"
+HOOK = CLAUDE_CODE / "hooks" / "npm-to-pnpm.py"
+NATIVE_HOOK = CLAUDE_CODE / "native" / "target" / "release" / "npm-to-pnpm"
+
+CASES = [
+    ("npm install", "pnpm install"),
+    ("npm i", "pnpm install"),
+    ("npm install lodash", "pnpm add lodash"),
+    ("npm i -D typescript", "pnpm add -D typescript"),
+    ("npm install -g pnpm", "pnpm add -g pnpm"),
+    ("npm uninstall lodash", "pnpm remove lodash"),
+    ("npm run dev", "pnpm run dev"),
+    ("cd app && npm install && npm run build", "cd app && pnpm install && pnpm run build"),
+    ('echo "npm install foo" | cat', None),
+    ("npm install pkg>log.txt", "pnpm add pkg>log.txt"),
+    # Option values are not package names
+    ("npm install --registry https://r.example.com", "pnpm install --registry https://r.example.com"),
+    ("npm i --loglevel error", "pnpm install --loglevel error"),
+    ("npm install --prefix ./dir", "pnpm install --prefix ./dir"),
+    ("npm install --registry https://r.example.com lodash", "pnpm add --registry https://r.example.com lodash"),
+    # fd redirections are operators, not a package called "2"
+    ("npm install 2>&1 | tail -20", "pnpm install 2>&1 | tail -20"),
+    ("npm i lodash 2>/dev/null", "pnpm add lodash 2>/dev/null"),
+]
+
+# Extra inputs for the native parity check (quoting, operators, odd spacing)
+PARITY_COMMANDS = [
+    "npm   run  \"my script\"",
+    "npm i; npm i -g yarn",
+    "sudo npm un -g x",
+    "npm install -D",
+    "npm install --save-dev jest",
+    "(npm install) && npm i 'a b'",
+    "npm install >&2 && npm i -w pkg lodash",
+    "npm install --omit=dev --cache /tmp/c",
+    "echo npm\\ install 2>err.log",
+    "npmx foo; npm ci",
+]
+
+
+def run_hook(hook, command):
+    """Run a hook on a Bash tool call, returning the rewritten command (or None)."""
+    payload = json.dumps({"tool_name": "Bash", "tool_input": {"command": command}})
+    result = subprocess.run(hook, input=payload, capture_output=True, text=True, check=True)
+    if not result.stdout.strip():
+        return None
+    return json.loads(result.stdout)["hookSpecificOutput"]["updatedInput"]["command"]
+
+
+@pytest.mark.parametrize(("command", "expected"), CASES)
+def test_convert(command, expected):
+    """Test that npm commands are rewritten to their pnpm equivalents."""
+    assert run_hook([sys.executable, str(HOOK)], command) == expected
+
+
+@pytest.mark.skipif(not NATIVE_HOOK.exists(), reason="native hooks not built (cargo build --release)")
+@pytest.mark.parametrize("command", [command for command, _ in CASES] + PARITY_COMMANDS)
+def test_native_parity(command):
+    """Test that the native build rewrites commands exactly like the Python hook."""
+    assert run_hook([str(NATIVE_HOOK)], command) == run_hook([sys.executable, str(HOOK)], command)